@@ -1,4 +1,4 @@
-import click, os, sys, httpx, uvicorn
+import click, os, sys
 from dotenv import load_dotenv
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
@@ -39,6 +39,7 @@ def main(host: str, port: int):
     )
 
     # Start the uvicorn server with specified host and port
+    import uvicorn
     uvicorn.run(server.build(), host=host, port=port)
 
 def build_agent_card(host: str, port: int) -> AgentCard:
@@ -1,3 +1,5 @@
+import asyncio
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.types import (
@@ -23,7 +25,7 @@ class GreetAgentExecutor(AgentExecutor):
 
         - Validates user input
         - Starts a new task if needed
-        - Streams response from the agent
+        - Sends a progress update, then awaits the agent's reply
         - Pushes progress and completion events to the event queue
         """
         if not context.message:
@@ -37,46 +39,46 @@ class GreetAgentExecutor(AgentExecutor):
         if context.current_task is None:
             await event_queue.enqueue_event(task)
 
-        # Stream steps from the agent one-by-one
-        async for step in self.agent.stream(query, task.context_id):
-            if step["is_task_complete"]:
-                # Task is finished — send final artifact and mark it complete
-                await event_queue.enqueue_event(
-                    TaskArtifactUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
-                        artifact=new_text_artifact(
-                            name="greeting",
-                            description="Greeting with quote",
-                            text=step["content"],
-                        ),
-                        append=False,
-                        lastChunk=True,
-                    )
-                )
-                await event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
-                        status=TaskStatus(state=TaskState.completed),
-                        final=True,
-                    )
-                )
-            else: 
-                # Task is in progress — update the client with streaming content
-                await event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
-                        status=TaskStatus(
-                            state=TaskState.working,
-                            message=new_agent_text_message(
-                                step["content"], task.context_id, task.id
-                            ),
-                        ),
-                        final=False,
-                    )
-                )
+        # Let the client know we're working before the model call
+        await event_queue.enqueue_event(
+            TaskStatusUpdateEvent(
+                taskId=task.id,
+                contextId=task.context_id,
+                status=TaskStatus(
+                    state=TaskState.working,
+                    message=new_agent_text_message(
+                        self.agent.PROGRESS_TEXT, task.context_id, task.id
+                    ),
+                ),
+                final=False,
+            )
+        )
+
+        # The model reply isn't streamed, so await the final step directly
+        step = await self.agent.generate(query, task.context_id)
+
+        # Task is finished — send final artifact and mark it complete.
+        # Both enqueues are independent, so issue them together.
+        art = TaskArtifactUpdateEvent(
+            taskId=task.id,
+            contextId=task.context_id,
+            artifact=new_text_artifact(
+                name="greeting",
+                description="Greeting with quote",
+                text=step["content"],
+            ),
+            append=False,
+            lastChunk=True,
+        )
+        stat = TaskStatusUpdateEvent(
+            taskId=task.id,
+            contextId=task.context_id,
+            status=TaskStatus(state=TaskState.completed),
+            final=True,
+        )
+        await asyncio.gather(
+            event_queue.enqueue_event(art), event_queue.enqueue_event(stat)
+        )
 
     async def cancel(self, *_): 
         """
@@ -16,6 +16,9 @@ class GreetingQuoteAgent:
     # Declares what content types the agent can handle
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
+    # Progress update sent while the model thinks
+    PROGRESS_TEXT = "Crafting your personalized greeting…"
+
     def __init__(self) -> None:
         # Initialize the Gemini Flash model with a bit of warmth (temperature=0.7)
         self.model = ChatGoogleGenerativeAI(model="gemini-2.0-flash", temperature=0.7)
@@ -41,6 +44,9 @@ class GreetingQuoteAgent:
         1. An initial progress update to simulate thinking.
         2. The final formatted greeting + quote.
 
+        Kept for callers that expect the streaming contract; the executor
+        sends `PROGRESS_TEXT` itself and awaits `generate` instead.
+
         Args:
             query (str): The user’s greeting or message.
             session_id (str): A2A session context ID.
@@ -52,9 +58,24 @@ class GreetingQuoteAgent:
         yield {
             "is_task_complete": False,
             "require_user_input": False,
-            "content": "Crafting your personalized greeting…",
+            "content": self.PROGRESS_TEXT,
         }
+        yield await self.generate(query, session_id)
+
+    async def generate(self, query: str, session_id: str) -> dict[str, Any]:
+        """
+        Non-streaming variant of `stream` returning only the final step.
+
+        The Gemini call is a single ``ainvoke``, so there is nothing to gain
+        from driving it through an async generator.
 
+        Args:
+            query (str): The user’s greeting or message.
+            session_id (str): A2A session context ID.
+
+        Returns:
+            The completed step dict with the greeting + quote.
+        """
         # Construct system + user message stack
         messages = [
             ("system", self.system_prompt),
@@ -64,10 +85,10 @@ class GreetingQuoteAgent:
         # Send the request to Gemini and await the response
         result: AIMessage = await self.model.ainvoke(messages, RunnableConfig())
 
-        # Clean up the final output and yield as task completion
+        # Clean up the final output and return it as task completion
         final_text = result.content.strip()
 
-        yield {
+        return {
             "is_task_complete": True,
             "require_user_input": False,
             "content": final_text,
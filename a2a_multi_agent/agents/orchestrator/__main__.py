@@ -1,4 +1,5 @@
-import asyncio, os, sys, uvicorn, httpx, json
+import os, sys
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 import click
 
@@ -39,7 +40,13 @@ def main(host: str, port: int, peers: str):
         agent_card=build_agent_card(host, port),
         http_handler=handler,
     )
-    uvicorn.run(server.build(), host=host, port=port)
+    @asynccontextmanager
+    async def lifespan(_app):
+        yield
+        await router.aclose()               # release pooled connections
+
+    import uvicorn
+    uvicorn.run(server.build(lifespan=lifespan), host=host, port=port)
 
 def build_agent_card(host: str, port: int) -> AgentCard:
     return AgentCard(
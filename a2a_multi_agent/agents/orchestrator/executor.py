@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.types import (
@@ -10,6 +13,8 @@ from a2a.types import (
 )
 from a2a.utils import new_agent_text_message, new_task, new_text_artifact
 
+BATCH_WINDOW = 0.1  # seconds over which consecutive "working" updates coalesce
+
 class OrchestratorExecutor(AgentExecutor):
     """Relays helper-agent events and appends one final completed status."""
 
@@ -25,31 +30,32 @@ class OrchestratorExecutor(AgentExecutor):
         if ctx.current_task is None:
             await q.enqueue_event(orch_task)
 
-        async for helper_event in self.router.stream(query, orch_task.context_id):
-
-            ev = (
-                helper_event.model_dump(exclude_none=True)
-                if hasattr(helper_event, "model_dump")
-                else helper_event
-            )
-
-            if "artifact" in ev or "artifacts" in ev:
-                artev = _make_artifact_event(ev, orch_task)
-                await q.enqueue_event(artev)
-
-                answer = _first_text(artev.artifact.model_dump())
-                await _enqueue_completed(q, orch_task, answer)
-                break
-
-            if ev.get("kind") == "task" and "status" in ev:
-                stat = _make_status_event(ev, orch_task)
-                await q.enqueue_event(stat)
-                continue
-
-            if ev.get("is_task_complete"):
-                answer = ev["content"]
-                await q.enqueue_event(
-                    TaskArtifactUpdateEvent(
+        batcher = _StreamBatcher(q, orch_task)
+        try:
+            async for helper_event in self.router.stream(query, orch_task.context_id):
+
+                artifact, kind, status, is_complete, content = _peek(helper_event)
+
+                if artifact is not None:
+                    await batcher.flush()
+                    artev = _make_artifact_event(artifact, orch_task)
+                    answer = _first_text(artev.artifact.model_dump())
+                    await _enqueue_completed(q, orch_task, artev, answer)
+                    break
+
+                if kind == "task" and status is not None:
+                    status = TaskStatus.model_validate(status)
+                    if status.state == TaskState.working:
+                        await batcher.add(status)
+                    else:
+                        await batcher.flush()
+                        await q.enqueue_event(_make_status_event(status, orch_task))
+                    continue
+
+                if is_complete:
+                    await batcher.flush()
+                    answer = content
+                    artev = TaskArtifactUpdateEvent(
                         taskId=orch_task.id,
                         contextId=orch_task.context_id,
                         artifact=new_text_artifact(
@@ -60,72 +66,134 @@ class OrchestratorExecutor(AgentExecutor):
                         append=False,
                         lastChunk=True,
                     )
-                )
-                await _enqueue_completed(q, orch_task, answer)
-                break
-
-            await q.enqueue_event(
-                TaskStatusUpdateEvent(
-                    taskId=orch_task.id,
-                    contextId=orch_task.context_id,
-                    status=TaskStatus(
-                        state=TaskState.working,
-                        message=new_agent_text_message(
-                            ev["content"], orch_task.context_id, orch_task.id
-                        ),
-                    ),
-                    final=False,
-                )
-            )
+                    await _enqueue_completed(q, orch_task, artev, answer)
+                    break
+
+                if content is not None:
+                    await batcher.add(
+                        TaskStatus(
+                            state=TaskState.working,
+                            message=new_agent_text_message(
+                                content, orch_task.context_id, orch_task.id
+                            ),
+                        )
+                    )
+        finally:
+            await batcher.flush()
 
     async def cancel(self, *_):
         raise NotImplementedError("Cancel not supported")
 
 
-def _make_artifact_event(d: dict, task) -> TaskArtifactUpdateEvent:
-    art = d["artifact"] if "artifact" in d else d["artifacts"][0]
+class _StreamBatcher:
+    """
+    Throttles consecutive "working" status updates.
+
+    The first update after a quiet spell is relayed at once; any that arrive
+    within the next BATCH_WINDOW seconds are coalesced and only the latest
+    is sent when the window closes. flush() sends a pending update straight
+    away and is called before any other event is relayed, so ordering on
+    the queue is preserved.
+    """
+
+    def __init__(self, q: EventQueue, task, window: float = BATCH_WINDOW):
+        self.q = q
+        self.task = task
+        self.window = window
+        self.pending: TaskStatus | None = None
+        self._timer: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, status: TaskStatus) -> None:
+        self.pending = status
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._close_window())
+            await self._emit()
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self._emit()
+
+    async def _close_window(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        if self.pending is not None:
+            # Something arrived during the window: send it and keep throttling
+            self._timer = asyncio.create_task(self._close_window())
+            await self._emit()
+
+    async def _emit(self) -> None:
+        async with self._lock:
+            status, self.pending = self.pending, None
+            if status is not None:
+                await self.q.enqueue_event(_make_status_event(status, self.task))
+
+
+def _peek(ev) -> tuple:
+    """
+    Read the fields the relay branches on straight off a helper event.
+
+    Works for both the router's own progress dicts and SDK pydantic models,
+    so nothing is dumped just to look at a handful of keys.
+    """
+    get = ev.get if isinstance(ev, dict) else lambda k: getattr(ev, k, None)
+    artifact = get("artifact")
+    if artifact is None:
+        artifacts = get("artifacts")
+        artifact = artifacts[0] if artifacts else None
+    return artifact, get("kind"), get("status"), get("is_task_complete"), get("content")
+
+
+def _make_artifact_event(art, task) -> TaskArtifactUpdateEvent:
     return TaskArtifactUpdateEvent(
         taskId=task.id, contextId=task.context_id,
         artifact=art, append=False, lastChunk=True
     )
 
 
-def _make_status_event(d: dict, task) -> TaskStatusUpdateEvent:
+def _make_status_event(status, task) -> TaskStatusUpdateEvent:
     return TaskStatusUpdateEvent(
         taskId=task.id,
         contextId=task.context_id,
-        status=TaskStatus.model_validate(d["status"]),
+        status=TaskStatus.model_validate(status),
         final=False,
     )
 
 
 def _first_text(node: dict | list) -> str | None:
-    """DFS for parts[*].text."""
-    if isinstance(node, dict):
-        if node.get("kind") == "text":
-            return node.get("text")
-        for v in node.values():
-            t = _first_text(v)
-            if t:
-                return t
-    elif isinstance(node, list):
-        for item in node:
-            t = _first_text(item)
-            if t:
-                return t
+    """DFS for parts[*].text, iterative to avoid per-level call overhead."""
+    stack = deque([node])
+    while stack:
+        n = stack.pop()
+        if isinstance(n, dict):
+            if n.get("kind") == "text":
+                if t := n.get("text"):
+                    return t
+                continue
+            stack.extend(reversed(n.values()))
+        elif isinstance(n, list):
+            stack.extend(reversed(n))
     return None
 
 
-async def _enqueue_completed(q: EventQueue, task, text: str):
-    """Send the final completed status that Streamlit will display."""
-    await q.enqueue_event(
-        TaskStatusUpdateEvent(
-            taskId=task.id,
-            contextId=task.context_id,
-            status=TaskStatus(
-                state=TaskState.completed,
-                message=new_agent_text_message(text, task.context_id, task.id),
-            ),
-            final=True,
-        )
+async def _enqueue_completed(
+    q: EventQueue, task, artev: TaskArtifactUpdateEvent, text: str
+):
+    """
+    Send the answer artifact and the final completed status that Streamlit
+    will display. The two enqueues are independent, so they are issued
+    together; gather starts them in order and EventQueue.enqueue_event only
+    suspends when the queue is full, so the artifact still lands first.
+    """
+    stat = TaskStatusUpdateEvent(
+        taskId=task.id,
+        contextId=task.context_id,
+        status=TaskStatus(
+            state=TaskState.completed,
+            message=new_agent_text_message(text, task.context_id, task.id),
+        ),
+        final=True,
     )
+    await asyncio.gather(q.enqueue_event(artev), q.enqueue_event(stat))
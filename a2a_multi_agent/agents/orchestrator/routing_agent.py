@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import asyncio, httpx, json, logging, os, re
-from typing import Any, AsyncIterable, Dict, List
+import asyncio, httpx, itertools, logging, os, re, time
+from collections import Counter
+from typing import Any, AsyncIterable, Dict, List, Set
 from uuid import uuid4
 
-from a2a.client import ClientFactory, ClientConfig
+from a2a.client import Client, ClientFactory, ClientConfig
+import orjson
 from a2a.types import AgentCard
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import AIMessage
@@ -12,14 +14,43 @@ from langchain_core.messages import AIMessage
 from httpx import ReadError, RemoteProtocolError
 from asyncio import CancelledError
 
+try:                                   # optional: O(|query|) keyword routing
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 DISCOVERY_INTERVAL = 600      
+DISCOVERY_CONCURRENCY = 16
+_URL_RE = re.compile(r"https?://[^\s\"'<>]+")
+
+# messageId only has to be unique, not random: one random prefix per process
+# plus a counter avoids an os.urandom read per outbound message.
+_MID_PREFIX = uuid4().hex[:8]
+_MID_COUNTER = itertools.count()
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+def _whole_word(q: str, start: int, end: int) -> bool:
+    """True when q[start:end] is not part of a longer word ("time" ≠ "sometimes")."""
+    return (start == 0 or not _is_word(q[start - 1])) and (
+        end == len(q) or not _is_word(q[end])
+    )
+
+def _has_word(q: str, word: str) -> bool:
+    i = q.find(word)
+    while i != -1:
+        if _whole_word(q, i, i + len(word)):
+            return True
+        i = q.find(word, i + 1)
+    return False
 
-async def _fetch_card(session: httpx.AsyncClient, url: str) -> AgentCard | None:
+async def _fetch_card(http: httpx.AsyncClient, url: str) -> AgentCard | None:
     try:
-        res = await session.get(f"{url}/.well-known/agent-card.json", timeout=5)
+        res = await http.get(f"{url}/.well-known/agent-card.json")
         res.raise_for_status()
-        return AgentCard.model_validate(res.json())
+        return AgentCard.model_validate_json(res.content)
     except Exception as exc:
         logger.warning("Failed to get card from %s: %s", url, exc)
         return None
@@ -39,31 +70,83 @@ class OrchestratorRoutingAgent:
     def __init__(self, peer_urls: List[str]):
         self.peer_urls = peer_urls
         self.cards: Dict[str, AgentCard] = {}
+        self._agents_json = ""
+        self._tag_index: Dict[str, str] = {}
+        self._tag_automaton = None
         self.last_discovery = 0.0
+        self._discovered = asyncio.Event()
+        self._discover_lock = asyncio.Lock()
+
+        # One pooled client for every discovery round, so card refreshes reuse
+        # keep-alive connections instead of re-handshaking with each peer.
+        self._http = httpx.AsyncClient(
+            timeout=5,
+            limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+        )
 
         model = os.getenv("ORCH_MODEL", "gemini-1.5-flash")
         self.model = ChatGoogleGenerativeAI(model=model)
         self.client_factory = ClientFactory(ClientConfig())
+        self._client_cache: Dict[str, Client] = {}
+        # Streams still using each client, and evicted clients that are only
+        # closed once their last stream finishes.
+        self._in_flight: Counter[Client] = Counter()
+        self._retired: Set[Client] = set()
 
-        asyncio.get_event_loop().run_until_complete(self._discover())
+    async def _ensure_discovered(self):
+        """Discover peers on first use and again once the cards go stale."""
+        async with self._discover_lock:
+            if (
+                not self._discovered.is_set()
+                or time.monotonic() - self.last_discovery > DISCOVERY_INTERVAL
+            ):
+                await self._discover()
 
     async def _discover(self):
-        async with httpx.AsyncClient() as s:
-            found = await asyncio.gather(*(_fetch_card(s, u) for u in self.peer_urls))
-        self.cards = {c.url: c for c in found if c}
-        self.last_discovery = asyncio.get_event_loop().time()
+        sem = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+
+        async def guarded(url: str) -> AgentCard | None:
+            async with sem:
+                return await _fetch_card(self._http, url)
+
+        found = await asyncio.gather(*map(guarded, self.peer_urls))
+        old_cards, self.cards = self.cards, {c.url: c for c in found if c}
+
+        # Drop cached clients for peers that vanished or published a new card.
+        # Streams already running through one keep it until they finish.
+        for url in list(self._client_cache):
+            if self.cards.get(url) != old_cards.get(url):
+                client = self._client_cache.pop(url)
+                if self._in_flight[client]:
+                    self._retired.add(client)
+                else:
+                    await client.close()
+
+        self._agents_json = self._build_agents_json()
+        self._tag_index = self._build_tag_index()
+        self._tag_automaton = self._build_tag_automaton()
+        self.last_discovery = time.monotonic()
+        self._discovered.set()
         logger.info("Discovered %d helper agents", len(self.cards))
 
+    async def aclose(self):
+        """Release pooled HTTP connections; called on server shutdown."""
+        for client in [*self._client_cache.values(), *self._retired]:
+            await client.close()
+        self._client_cache.clear()
+        self._retired.clear()
+        await self._http.aclose()
+
     async def stream(
         self, query: str, session_id: str
     ) -> AsyncIterable[Dict[str, Any]]:
 
-        if asyncio.get_event_loop().time() - self.last_discovery > DISCOVERY_INTERVAL:
-            await self._discover()
+        await self._ensure_discovered()
 
-        helper_url = await self._choose_agent(query)
-        if helper_url == "NONE" or helper_url not in self.cards:
-            helper_url = self._fallback_by_tags(query.lower())
+        # A clear keyword hit is deterministic, so only ask Gemini otherwise
+        helper_url = self._fallback_by_tags(query.lower())
+        if helper_url == "NONE":
+            helper_url = await self._choose_agent(query)
 
         if helper_url == "NONE" or helper_url not in self.cards:
             yield {
@@ -74,30 +157,57 @@ class OrchestratorRoutingAgent:
             return
 
         card   = self.cards[helper_url]
-        client = self.client_factory.create(card)
-
-        yield {
-            "is_task_complete": False,
-            "require_user_input": False,
-            "content": f"Asking **{card.name}**…",
-        }
+        client = self._client_cache.get(helper_url)
+        if client is None:
+            client = self.client_factory.create(card)
+            self._client_cache[helper_url] = client
 
         user_msg = {
             "role": "user",
             "parts": [{"kind": "text", "text": query}],
-            "messageId": uuid4().hex,
+            "messageId": f"{_MID_PREFIX}{next(_MID_COUNTER):x}",
         }
 
+        self._in_flight[client] += 1
         stream = client.send_message(user_msg)
 
+        # Start the downstream request now so it is in flight while the
+        # "Asking…" frame is relayed, instead of only after it.
+        first = asyncio.ensure_future(anext(stream))
         try:                                   
+            yield {
+                "is_task_complete": False,
+                "require_user_input": False,
+                "content": f"Asking **{card.name}**…",
+            }
+
+            ev = await first
+            yield ev[0] if isinstance(ev, tuple) else ev
             async for ev in stream:
                 yield ev[0] if isinstance(ev, tuple) else ev
+        except StopAsyncIteration:
+            pass
         except (CancelledError, ReadError, RemoteProtocolError) as exc:
             logger.debug("Down-stream SSE closed: %s", exc)
+        finally:
+            if not first.done():
+                first.cancel()
+            elif not first.cancelled():
+                first.exception()               # mark a failed first step as seen
+            await self._release(client)
 
-    async def _choose_agent(self, question: str) -> str:
-        agents_json = json.dumps(
+    async def _release(self, client: Client):
+        """End one stream on *client*; close it if it was evicted meanwhile."""
+        self._in_flight[client] -= 1
+        if self._in_flight[client] <= 0:
+            del self._in_flight[client]
+            if client in self._retired:
+                self._retired.discard(client)
+                await client.close()
+
+    def _build_agents_json(self) -> str:
+        """Serialise the routing catalog once per discovery, not per query."""
+        return orjson.dumps(
             [
                 {
                     "url": c.url,
@@ -115,9 +225,13 @@ class OrchestratorRoutingAgent:
                     ],
                 }
                 for c in self.cards.values()
-            ],
-            indent=2,
-        )
+            ]
+        ).decode()
+
+    async def _choose_agent(self, question: str) -> str:
+        if not self._agents_json:
+            await self._ensure_discovered()
+        agents_json = self._agents_json
 
         prompt = [
             ("system", self.SYSTEM_PROMPT),
@@ -126,16 +240,40 @@ class OrchestratorRoutingAgent:
              f"User question:\n{question}\n\nChosen URL:")
         ]
         reply: AIMessage = await self.model.ainvoke(prompt)
-        match = re.search(r"https?://[^\s\"'<>]+", reply.content)
+        match = _URL_RE.search(reply.content)
         url   = match.group(0) if match else "NONE"
         logger.info("Gemini routing decision: %s", url)
         return url
 
-    def _fallback_by_tags(self, q: str) -> str:
+    def _build_tag_index(self) -> Dict[str, str]:
+        """Map each lower-cased skill id/tag to its agent URL (first card wins)."""
+        index: Dict[str, str] = {}
         for c in self.cards.values():
-            for sk in c.skills:
-                if sk.id and sk.id.lower() in q:
-                    return c.url
-                if any(tag.lower() in q for tag in sk.tags or []):
-                    return c.url
-        return "NONE"
+            for sk in c.skills or []:
+                for tag in [sk.id, *(sk.tags or [])]:
+                    if tag:
+                        index.setdefault(tag.lower(), c.url)
+        return index
+
+    def _build_tag_automaton(self):
+        """Aho-Corasick automaton over _tag_index, or None without pyahocorasick."""
+        if ahocorasick is None or not self._tag_index:
+            return None
+        automaton = ahocorasick.Automaton()
+        for rank, (tag, url) in enumerate(self._tag_index.items()):
+            automaton.add_word(tag, (rank, url, len(tag)))
+        automaton.make_automaton()
+        return automaton
+
+    def _fallback_by_tags(self, q: str) -> str:
+        if self._tag_automaton is not None:
+            # Single pass over the query; only whole-word hits count, and the
+            # one that comes first in _tag_index wins, as in the dict scan.
+            hits = [
+                hit for end, hit in self._tag_automaton.iter(q)
+                if _whole_word(q, end + 1 - hit[2], end + 1)
+            ]
+            return min(hits)[1] if hits else "NONE"
+        return next(
+            (url for tag, url in self._tag_index.items() if _has_word(q, tag)), "NONE"
+        )
@@ -2,7 +2,6 @@ import os
 import sys
 
 import click
-import httpx
 from dotenv import load_dotenv
 
 from .agent import TellTimeByLocationAgent
@@ -23,8 +22,6 @@ def main(host: str, port: int):
         print("GOOGLE_API_KEY environment variable not set.")
         sys.exit(1)
 
-    client = httpx.AsyncClient()
-
     handler = DefaultRequestHandler(
         agent_executor=TellTimeAgentExecutor(),
         task_store=InMemoryTaskStore(),
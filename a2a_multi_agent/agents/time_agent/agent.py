@@ -1,9 +1,9 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, AsyncIterable, Literal
 import logging
-import re
 from zoneinfo import ZoneInfo, available_timezones
 
 from pydantic import BaseModel
@@ -15,7 +15,45 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import create_react_agent
 
 logger = logging.getLogger(__name__)
-memory = MemorySaver()
+
+# --------------------------------------------------------------------------- #
+# Checkpointer: MemorySaver capped to the most recently used sessions          #
+# --------------------------------------------------------------------------- #
+class BoundedMemorySaver(MemorySaver):
+    """
+    ``MemorySaver`` that keeps at most *capacity* threads (A2A sessions),
+    dropping the least recently used one when a new thread is written.
+    """
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        super().__init__()
+        self._cap = capacity
+        self._order: OrderedDict[str, None] = OrderedDict()
+
+    def _touch(self, thread_id: str) -> None:
+        self._order[thread_id] = None
+        self._order.move_to_end(thread_id)
+
+    def get_tuple(self, config: RunnableConfig):
+        thread_id = config["configurable"]["thread_id"]
+        if thread_id in self._order:
+            self._order.move_to_end(thread_id)
+        return super().get_tuple(config)
+
+    def put(self, config: RunnableConfig, checkpoint, metadata, new_versions):
+        self._touch(config["configurable"]["thread_id"])
+        while len(self._order) > self._cap:
+            oldest, _ = self._order.popitem(last=False)
+            self.delete_thread(oldest)
+        return super().put(config, checkpoint, metadata, new_versions)
+
+
+memory = BoundedMemorySaver(10_000)
+
+# Lookup tables built once at import: lower-cased IANA name → canonical name,
+# and lower-cased last path component ("tokyo") → canonical name.
+_TZ_LOWER = {z.lower(): z for z in sorted(available_timezones())}
+_TZ_SUFFIX = {z.rsplit("/", 1)[-1].lower(): z for z in _TZ_LOWER.values()}
 
 # --------------------------------------------------------------------------- #
 # Tool: get_time                                                              #
@@ -35,22 +73,16 @@ def get_time(location: str) -> dict[str, str]:
     """
     loc = location.strip().lower()
 
-    if loc in map(str.lower, available_timezones()):
-        tz = ZoneInfo(loc)
-    else:
-        match = next(
-            (z for z in available_timezones()
-             if re.search(rf"{re.escape(loc)}", z, re.I)),
-            None,
+    tz_name = _TZ_LOWER.get(loc) or _TZ_SUFFIX.get(loc)
+    if tz_name is None and loc:
+        tz_name = next((full for lower, full in _TZ_LOWER.items() if loc in lower), None)
+    if tz_name is None:
+        raise ValueError(
+            "Unknown location. Please provide a valid country or time-zone "
+            "(e.g. 'Asia/Tokyo' or just 'tokyo')."
         )
-        if match:
-            tz = ZoneInfo(match)
-        else:
-            raise ValueError(
-                "Unknown location. Please provide a valid country or time-zone "
-                "(e.g. 'Asia/Tokyo' or just 'tokyo')."
-            )
 
+    tz = ZoneInfo(tz_name)
     now = datetime.now(tz).strftime("%H:%M:%S")
     return {"current_time": now, "timezone": str(tz)}
 
@@ -111,33 +143,41 @@ class TellTimeByLocationAgent:
         cfg: RunnableConfig = {"configurable": {"thread_id": session_id}}
         inputs = {"messages": [("user", query)]}
 
-        for step in self.graph.stream(inputs, cfg, stream_mode="values"):
-            msg = step["messages"][-1]
-
-            # The agent is about to call the tool
-            if isinstance(msg, AIMessage) and msg.tool_calls:
-                yield {
-                    "is_task_complete": False,
-                    "require_user_input": False,
-                    "content": "Fetching the local time…",
-                }
-
-            # The tool has returned; the agent is formatting
-            elif isinstance(msg, ToolMessage):
-                yield {
-                    "is_task_complete": False,
-                    "require_user_input": False,
-                    "content": "Formatting the result…",
-                }
+        # "updates" yields only each node's delta, not the whole state; each
+        # progress message is sent at most once per request.
+        tool_yielded = fmt_yielded = False
+        async for update in self.graph.astream(inputs, cfg, stream_mode="updates"):
+            for payload in update.values():
+                if not isinstance(payload, dict) or not payload.get("messages"):
+                    continue
+                msg = payload["messages"][-1]
+
+                # The agent is about to call the tool
+                if not tool_yielded and isinstance(msg, AIMessage) and msg.tool_calls:
+                    tool_yielded = True
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": "Fetching the local time…",
+                    }
+
+                # The tool has returned; the agent is formatting
+                elif not fmt_yielded and isinstance(msg, ToolMessage):
+                    fmt_yielded = True
+                    yield {
+                        "is_task_complete": False,
+                        "require_user_input": False,
+                        "content": "Formatting the result…",
+                    }
 
         # After the stream ends send the final result
-        yield self._final(cfg)
+        yield await self._final(cfg)
 
     # --------------------------------------------------------------------- #
     # Helpers                                                                #
     # --------------------------------------------------------------------- #
-    def _final(self, cfg: RunnableConfig) -> dict[str, Any]:
-        state = self.graph.get_state(cfg)
+    async def _final(self, cfg: RunnableConfig) -> dict[str, Any]:
+        state = await self.graph.aget_state(cfg)
         structured = state.values.get("structured_response")
 
         if isinstance(structured, ResponseFormat):
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import suppress
+
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events.event_queue import EventQueue
 from a2a.types import (
@@ -10,6 +13,8 @@ from a2a.utils import new_agent_text_message, new_task, new_text_artifact
 
 from .agent import TellTimeByLocationAgent as TellTimeAgent
 
+STEP_QUEUE_SIZE = 32
+
 class TellTimeAgentExecutor(AgentExecutor):
     def __init__(self) -> None:
         self.agent = TellTimeAgent()
@@ -25,12 +30,41 @@ class TellTimeAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             await event_queue.enqueue_event(task)
 
-        async for step in self.agent.stream(query, task.context_id):
-            if step["is_task_complete"]:
-                await event_queue.enqueue_event(
-                    TaskArtifactUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
+        # Fixed per task: ids and the status-update envelopes. Per step only the
+        # status is swapped in via model_copy, skipping envelope validation.
+        tid, cid = task.id, task.context_id
+        working = TaskStatusUpdateEvent.model_construct(
+            task_id=tid, context_id=cid, final=False
+        )
+        final = TaskStatusUpdateEvent.model_construct(
+            task_id=tid, context_id=cid, final=True
+        )
+
+        # Agent steps and event emission run as two stages joined by a bounded
+        # queue, so a slow event consumer doesn't stall the graph stream.
+        steps: asyncio.Queue = asyncio.Queue(maxsize=STEP_QUEUE_SIZE)
+
+        async def produce() -> None:
+            try:
+                async for step in self.agent.stream(query, cid):
+                    await steps.put(step)
+            except asyncio.CancelledError:
+                # The consumer may be gone; never block on a full queue here
+                with suppress(asyncio.QueueFull):
+                    steps.put_nowait(None)
+                raise
+            except Exception:
+                await steps.put(None)
+                raise
+            await steps.put(None)
+
+        async def consume() -> None:
+            while (step := await steps.get()) is not None:
+                if step["is_task_complete"]:
+                    # Artifact and completion are independent; issue them together
+                    art = TaskArtifactUpdateEvent(
+                        taskId=tid,
+                        contextId=cid,
                         artifact=new_text_artifact(
                             name="current_result",
                             description="Result of request to agent.",
@@ -39,46 +73,38 @@ class TellTimeAgentExecutor(AgentExecutor):
                         append=False,
                         lastChunk=True,
                     )
-                )
-                await event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
-                        status=TaskStatus(state=TaskState.completed),
-                        final=True,
+                    stat = final.model_copy(
+                        update={"status": TaskStatus(state=TaskState.completed)}
                     )
-                )
-                continue
+                    await asyncio.gather(
+                        event_queue.enqueue_event(art), event_queue.enqueue_event(stat)
+                    )
+                    continue
 
-            if step["require_user_input"]:
-                await event_queue.enqueue_event(
-                    TaskStatusUpdateEvent(
-                        taskId=task.id,
-                        contextId=task.context_id,
-                        status=TaskStatus(
+                if step["require_user_input"]:
+                    await event_queue.enqueue_event(
+                        final.model_copy(update={"status": TaskStatus(
                             state=TaskState.input_required,
-                            message=new_agent_text_message(
-                                step["content"], task.context_id, task.id
-                            ),
-                        ),
-                        final=True,
+                            message=new_agent_text_message(step["content"], cid, tid),
+                        )})
                     )
-                )
-                continue
+                    continue
 
-            await event_queue.enqueue_event(
-                TaskStatusUpdateEvent(
-                    taskId=task.id,
-                    contextId=task.context_id,
-                    status=TaskStatus(
+                await event_queue.enqueue_event(
+                    working.model_copy(update={"status": TaskStatus(
                         state=TaskState.working,
-                        message=new_agent_text_message(
-                            step["content"], task.context_id, task.id
-                        ),
-                    ),
-                    final=False,
+                        message=new_agent_text_message(step["content"], cid, tid),
+                    )})
                 )
-            )
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            # Drain everything the agent produced, then surface its error (if any)
+            await consume()
+            await producer
+        finally:
+            # If emitting fails, don't leave the producer blocked on a full queue
+            producer.cancel()
 
     async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
         raise NotImplementedError("Cancel not supported")
@@ -1,10 +1,11 @@
-import asyncio, inspect, json, os
-from uuid import uuid4
+import asyncio, atexit, inspect, logging, os, secrets, threading
+from collections import deque
 from typing import Any, Dict, List, Union
 
 import httpx
+import orjson
 import streamlit as st
-from a2a.client import ClientFactory, ClientConfig
+from pydantic import BaseModel
 from a2a.types import AgentCard, SendMessageRequest, MessageSendParams
 
 # ────────────────────────────────────────────────────────────────────────────
@@ -12,35 +13,115 @@ from a2a.types import AgentCard, SendMessageRequest, MessageSendParams
 # ────────────────────────────────────────────────────────────────────────────
 ORCH_URL = os.getenv("ORCHESTRATOR_URL", "http://localhost:10002")
 KNOWN_AGENT_URLS = [ORCH_URL]                 
+# A host that is down should fail in well under a second, not the full 5 s
+CARD_TIMEOUT = httpx.Timeout(connect=0.5, read=5, write=5, pool=5)
+
+logger = logging.getLogger(__name__)
 
 # ────────────────────────────────────────────────────────────────────────────
 # Discovery helpers
 # ────────────────────────────────────────────────────────────────────────────
-async def _load_card(session: httpx.AsyncClient, base: str) -> AgentCard | None:
+async def _load_card(http: httpx.AsyncClient, base: str) -> AgentCard | None:
     try:
-        r = await session.get(f"{base}/.well-known/agent-card.json", timeout=5)
+        r = await http.get(f"{base}/.well-known/agent-card.json", timeout=CARD_TIMEOUT)
         r.raise_for_status()
         return AgentCard.model_validate(r.json())
-    except Exception:
+    except (httpx.ConnectError, httpx.ConnectTimeout, httpx.ReadTimeout):
+        return None                             # agent not up (yet)
+    except Exception as exc:
+        logger.warning("Failed to get card from %s: %s", base, exc)
         return None
 
-async def _load_all_cards() -> List[AgentCard]:
-    async with httpx.AsyncClient() as s:
-        cards = await asyncio.gather(*(_load_card(s, u) for u in KNOWN_AGENT_URLS))
+async def _load_all_cards(http: httpx.AsyncClient) -> List[AgentCard]:
+    cards = await asyncio.gather(*(_load_card(http, u) for u in KNOWN_AGENT_URLS))
     return [c for c in cards if c]
 
 # ────────────────────────────────────────────────────────────────────────────
-# Cache: event-loop, agent card, SDK client
+# Cache: event-loop, pooled HTTP client, SDK clients (resource) and the
+# agent cards (data, refreshed every 5 minutes)
+#
+# All async work runs on one event loop that lives on a daemon thread; the
+# script thread hands it coroutines via run_coroutine_threadsafe. The loop,
+# the pooled httpx client and the SDK clients bound to it are built together,
+# once per server process, and never stopped.
 # ────────────────────────────────────────────────────────────────────────────
+def _start_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="a2a-loop", daemon=True).start()
+    return loop
+
+def _run(coro, loop: asyncio.AbstractEventLoop) -> Any:
+    """Run *coro* on the background *loop* and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
 @st.cache_resource(show_spinner=False)
 def _get_runtime():
-    loop = asyncio.new_event_loop()
-    cards = loop.run_until_complete(_load_all_cards())
-    factory = ClientFactory(ClientConfig())
-    clients: Dict[str, Any] = {c.url: factory.create(c) for c in cards}
-    return loop, cards, clients
+    # Held by Streamlit so it survives reruns (the script body does not)
+    loop = _start_loop()
+
+    # One pooled client for every card fetch, so keep-alive connections are
+    # reused when more agents or refreshes are added.
+    http = httpx.AsyncClient(
+        timeout=5,
+        limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+    )
+    atexit.register(lambda: loop.is_running() and _run(http.aclose(), loop))
+    # Imported here: a2a.client (and its transports) only loads when a
+    # runtime is first built, not as part of every script rerun.
+    from a2a.client import ClientFactory, ClientConfig
+
+    # SDK clients share the discovery pool, so the first send reuses the
+    # connection the card fetch already opened instead of dialling again.
+    factory = ClientFactory(ClientConfig(httpx_client=http))
+    clients: Dict[str, tuple[AgentCard, Any, str, bool]] = {}
+    return loop, http, factory, clients
 
-loop, CARDS, CLIENTS = _get_runtime()
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_cards(_runtime) -> List[dict]:
+    # Plain dicts so Streamlit can store them; discovery reruns on expiry
+    loop, http, *_ = _runtime
+    cards = _run(_load_all_cards(http), loop)
+    return [c.model_dump(mode="json", exclude_none=True) for c in cards]
+
+def _call_style(client) -> str:
+    # Reflect on the method once per client, not on every returned value
+    send = type(client).send_message
+    if inspect.isasyncgenfunction(send):
+        return "gen"
+    if inspect.iscoroutinefunction(send):
+        return "coro"
+    return "sync"
+
+def _needs_wrapper(client) -> bool:
+    # Older SDKs take a SendMessageRequest envelope rather than the message;
+    # read that off the signature instead of probing with a real call.
+    params = list(inspect.signature(client.send_message).parameters.values())
+    if not params:
+        return False
+    ann = params[0].annotation
+    return getattr(ann, "__name__", ann) == "SendMessageRequest"
+
+def _client_for(runtime, card: AgentCard) -> tuple[Any, str, bool]:
+    """SDK client, call style and wrapper flag for *card*, rebuilt only when the card changes."""
+    *_, factory, clients = runtime
+    cached = clients.get(card.url)
+    if cached is None or cached[0] != card:
+        client = factory.create(card)
+        cached = clients[card.url] = (
+            card, client, _call_style(client), _needs_wrapper(client)
+        )
+    return cached[1:]
+
+RUNTIME = _get_runtime()
+loop = RUNTIME[0]
+CARDS = [AgentCard.model_validate(c) for c in _cached_cards(RUNTIME)]
+CLIENTS: Dict[str, Any] = {}
+CLIENT_DISPATCH: Dict[str, str] = {}
+NEEDS_WRAPPER: Dict[str, bool] = {}
+for _card in CARDS:
+    (
+        CLIENTS[_card.url], CLIENT_DISPATCH[_card.url], NEEDS_WRAPPER[_card.url]
+    ) = _client_for(RUNTIME, _card)
 if not CARDS:
     st.error(f"Could not reach orchestrator at {ORCH_URL}")
     st.stop()
@@ -63,114 +144,166 @@ submitted = st.button("Send", type="primary")
 # ────────────────────────────────────────────────────────────────────────────
 # Utility helpers
 # ────────────────────────────────────────────────────────────────────────────
-def _serialisable(obj: Any) -> Any:
+def _dump_model(obj: Any) -> Any:
     if hasattr(obj, "model_dump"):
         return obj.model_dump(mode="json", exclude_none=True)
     if hasattr(obj, "dict"):
         return obj.dict(exclude_none=True)
-    return obj
+    raise TypeError
+
+def _to_json(obj: Any) -> str:
+    """JSON text of *obj* for display, without building an intermediate dict."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump_json(exclude_none=True)
+    # Untyped containers (tuples of events, dicts holding models) are encoded
+    # by orjson, with nested models dumped by the default hook.
+    try:
+        return orjson.dumps(obj, default=_dump_model).decode()
+    except orjson.JSONEncodeError:
+        return orjson.dumps(repr(obj)).decode()
 
 def _normalise(obj: Any) -> Any:
     if isinstance(obj, str):
         try:
-            return json.loads(obj)
-        except json.JSONDecodeError:
+            return orjson.loads(obj)
+        except orjson.JSONDecodeError:
             return obj
-    ser = _serialisable(obj)
-    return ser if isinstance(ser, (dict, list)) else obj
+    return obj
+
+def _fields(node: Any) -> dict | None:
+    """Field mapping of a dict or pydantic model, read in place (no dump)."""
+    if isinstance(node, dict):
+        return node
+    if isinstance(node, BaseModel):
+        return node.__dict__
+    return None
+
+_CONTAINERS = (dict, list, BaseModel)
 
 def _artifact_text(art: Union[dict, Any]) -> str | None:
-    parts = getattr(art, "parts", None) or art.get("parts", []) if isinstance(art, dict) else []
-    for p in parts:
-        kind = getattr(p, "kind", None) or p.get("kind")
-        if kind == "text":
-            return getattr(p, "text", None) or p.get("text")
-    return getattr(art, "text", None) or art.get("text") if isinstance(art, dict) else None
+    fields = _fields(art) or {}
+    for p in fields.get("parts") or []:
+        part = _fields(getattr(p, "root", p)) or {}     # Part is a RootModel
+        if part.get("kind") == "text":
+            return part.get("text")
+    return fields.get("text")
 
 def _walk(node: Any) -> str | None:
-    if isinstance(node, dict):
-        if "artifacts" in node:
-            for art in node["artifacts"]:
-                txt = _artifact_text(art)
-                if txt:
-                    return txt
-        if "artifact" in node:
-            txt = _artifact_text(node["artifact"])
-            if txt:
-                return txt
-        if "status" in node and isinstance(node["status"], dict):
-            msg = node["status"].get("message")
-            if isinstance(msg, dict):
-                txt = _walk(msg)
-                if txt:
-                    return txt
-        for v in node.values():
-            txt = _walk(v)
+    # Iterative DFS: artifacts → artifact → status.message → other values
+    stack = deque([node])
+    while stack:
+        n = stack.pop()
+        if isinstance(n, list):
+            stack.extend(v for v in reversed(n) if isinstance(v, _CONTAINERS))
+            continue
+        fields = _fields(n)
+        if fields is None:
+            continue
+        for art in fields.get("artifacts") or []:
+            txt = _artifact_text(art)
             if txt:
                 return txt
-    elif isinstance(node, list):
-        for item in node:
-            txt = _walk(item)
+        if fields.get("artifact") is not None:
+            txt = _artifact_text(fields["artifact"])
             if txt:
                 return txt
+        stack.extend(v for v in reversed(fields.values()) if isinstance(v, _CONTAINERS))
+        status = _fields(fields.get("status"))
+        if status and _fields(status.get("message")) is not None:
+            stack.append(status["message"])
     return None
 
 def _extract_text(node: Any) -> str | None:
     return _walk(_normalise(node))
 
 # ────────────────────────────────────────────────────────────────────────────
-# Stream collector: stop at first event that contains text
+# Streaming: text is handed to the page as each event arrives
 # ────────────────────────────────────────────────────────────────────────────
-async def _collect_stream(stream):
-    last_event = None
-    async for ev in stream:
-        ev = ev[0] if isinstance(ev, tuple) else ev
-        ev_dict = ev.model_dump(exclude_none=True) if hasattr(ev, "model_dump") else ev
-        if _extract_text(ev_dict):
-            return ev_dict                 
-        last_event = ev_dict
-    return last_event                       
-
-def _send_sync(client, payload):
-    try:
-        maybe = client.send_message(payload)           
-    except TypeError:
-        wrapper = SendMessageRequest(
-            id=uuid4().hex, params=MessageSendParams(message=payload)
+async def _events(url: str, payload):
+    """Events from the agent at *url*, whatever its client's call style."""
+    client, style = CLIENTS[url], CLIENT_DISPATCH[url]
+    if NEEDS_WRAPPER[url]:
+        payload = SendMessageRequest(
+            id=secrets.token_hex(16), params=MessageSendParams(message=payload)
         )
-        maybe = client.send_message(wrapper)           
+    if style == "coro":
+        yield await client.send_message(payload)
+        return
+    if style == "sync":
+        # Blocking clients run on a worker thread so they don't hold the loop
+        yield await asyncio.to_thread(client.send_message, payload)
+        return
+    stream = client.send_message(payload)
+    try:
+        async for ev in stream:
+            yield ev
+    finally:
+        # Close the SSE response as soon as we stop (e.g. the user reruns)
+        # so the orchestrator's stream is torn down straight away.
+        await stream.aclose()
+
+async def _texts(events, seen: List[Any]):
+    """Each piece of text in *events*; every event is kept in *seen*."""
+    started = False
+    async for ev in events:
+        # Client events are (task, update); the update holds just the new bit
+        task, update = ev if isinstance(ev, tuple) else (ev, None)
+        seen.append(task)
+        txt = _extract_text(update if update is not None else task)
+        if not txt:
+            continue
+        # Appended artifact chunks continue the current block; anything else
+        # starts a new one
+        if started and not getattr(update, "append", False):
+            txt = "\n\n" + txt
+        started = True
+        yield txt
+
+async def _anext(agen, default=None):
+    return await anext(agen, default)
 
-    if inspect.isasyncgen(maybe):
-        return loop.run_until_complete(_collect_stream(maybe))
-    if inspect.isawaitable(maybe):
-        return loop.run_until_complete(maybe)
-    return maybe
+def _iter_on_loop(agen, loop: asyncio.AbstractEventLoop):
+    """Drive the async generator *agen* on *loop* as a plain iterator."""
+    try:
+        while (item := _run(_anext(agen), loop)) is not None:
+            yield item
+    finally:
+        _run(agen.aclose(), loop)
 
 # ────────────────────────────────────────────────────────────────────────────
 # On click
 # ────────────────────────────────────────────────────────────────────────────
 if submitted and query.strip():
     card = CARDS[0]                                 
-    client = CLIENTS[card.url]
 
     st.info(f"**Using orchestrator:** {card.name}")
 
     user_msg = {
         "role": "user",
         "parts": [{"kind": "text", "text": query}],
-        "messageId": uuid4().hex,
+        "messageId": secrets.token_hex(16),
     }
 
+    st.subheader("Answer")
+    seen: List[Any] = []
+    chunks = _iter_on_loop(_texts(_events(card.url, user_msg), seen), loop)
+    slot = st.empty()
     try:
-        result = _send_sync(client, user_msg)
+        with slot:
+            # Markdown joins single newlines; force the line breaks through
+            answer = st.write_stream(c.replace("\n", "  \n") for c in chunks)
     except Exception as exc:
         st.error(f"Request failed: {exc}")
         st.stop()
+    if answer:
+        slot.success(answer)
 
-    answer = _extract_text(result) or json.dumps(_serialisable(result), indent=2)
-
-    st.subheader("Answer")
-    st.success(answer.replace("\n", "  \n"))
+    result = seen[-1] if seen else None
+    raw = _to_json(result)                          # once, for fallback and raw view
+    if not answer:
+        # Only the no-text fallback needs it parsed, to re-indent for reading
+        fallback = orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode()
+        st.success(fallback.replace("\n", "  \n"))
 
     with st.expander("Raw JSON response"):
-        st.json(_serialisable(result))
+        st.json(raw)